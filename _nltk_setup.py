@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+import nltk
+from nltk.corpus import stopwords
+
+# Ensure NLTK resources (once per process, shared by summarizer and chatbot)
+_resources = [("tokenizers/punkt", "punkt"), ("corpora/stopwords", "stopwords")]
+for path, name in _resources:
+    try:
+        nltk.data.find(path)
+    except LookupError:
+        nltk.download(name, quiet=True)
+
+
+@lru_cache(maxsize=1)
+def get_stopwords() -> frozenset:
+    return frozenset(stopwords.words("english"))
+
+
+@lru_cache(maxsize=1)
+def get_sent_tokenizer():
+    # Pretrained English Punkt model (what sent_tokenize uses), loaded once
+    return nltk.data.load("tokenizers/punkt/english.pickle")
+
+
+# Warm at import so the first request (or each gunicorn worker, with
+# preload_app) doesn't pay for unpickling the Punkt model
+get_sent_tokenizer()
@@ -1,10 +1,23 @@
+import io
 import logging
+import multiprocessing
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from flask import Flask, render_template, request, jsonify
+from lxml import etree
+from lxml import html as lhtml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Optional readability (readability-lxml)
 try:
@@ -13,7 +26,7 @@ try:
 except Exception:
     HAS_READABILITY = False
 
-from summarizer import summarize_text
+from summarizer import summarize_text_ex, summarize_cached, summarize_sentences
 from chatbot import chat_with_summary
 
 # Logging
@@ -26,6 +39,75 @@ app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # 32MB allowed upload (safe
 # Limits
 MAX_TEXT_LENGTH = 200_000
 MIN_TEXT_LENGTH = 50  # somewhat lower so many article pages pass
+MAX_FETCH_BYTES = 8_000_000  # abort downloads of pages larger than this
+SUMMARIZE_TIMEOUT = 30  # seconds
+
+# Opt-in (SUMMARIX_PROCESS_POOL=1, set by gunicorn.conf.py): summarization runs
+# in a process pool so it doesn't hold the GIL for request threads; otherwise
+# (flask run, `python app.py`, other servers) it stays in-process.
+# The pool is created lazily so each forked server worker gets its own, and its
+# processes come from a forkserver: forking the threaded server worker directly
+# could copy a lock held by another request thread into the child. Platforms
+# without forkserver (Windows) fall back to in-process.
+_POOL_REQUESTED = os.environ.get("SUMMARIX_PROCESS_POOL", "0") == "1"
+USE_PROCESS_POOL = _POOL_REQUESTED and "forkserver" in multiprocessing.get_all_start_methods()
+if _POOL_REQUESTED and not USE_PROCESS_POOL:
+    logger.warning("forkserver start method unavailable; summarizing in-process")
+# Split the cores between the server's worker processes, each of which has a pool
+SUMMARIZE_WORKERS = int(os.environ.get(
+    "SUMMARIX_SUMMARIZE_WORKERS",
+    max(1, (os.cpu_count() or 1) // max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))),
+))
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+# Shared HTTP session: keep-alive connection pool so repeated fetches to the
+# same host skip DNS/TCP/TLS setup
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    # Retry-After is ignored: urllib3 would otherwise sleep for whatever a 503
+    # asks, uncapped and outside the request timeout
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504],
+                      raise_on_status=False, respect_retry_after_header=False),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+SESSION.headers.update({
+    "User-Agent": "Summarix/1.0 (+https://example.com/) Python requests",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+})
+
+# Extracted text per URL with its validators: url -> (etag, last_modified, text)
+URL_CACHE_MAX = 256
+_URL_CACHE: "OrderedDict[str, Tuple[Optional[str], Optional[str], str]]" = OrderedDict()
+_URL_CACHE_LOCK = threading.Lock()
+
+# Wikipedia pages: only #mw-content-text becomes Python objects
+WIKI_STRAINER = SoupStrainer("div", attrs={"id": "mw-content-text"})
+
+# Tags dropped before generic extraction, and id/class/role substrings that mark boilerplate
+REMOVED_TAGS = frozenset({
+    "script", "style", "noscript", "iframe", "svg", "picture", "figure", "button", "input", "form",
+    "nav", "header", "footer", "aside",
+})
+NOISY_KEYWORDS = (
+    "nav", "menu", "header", "footer", "sidebar", "advert", "ads",
+    "cookie", "modal", "popup", "subscribe", "promo", "related", "breadcrumb", "share",
+    "comment", "toolbar", "infobox",
+)
+_NOISY_RE = re.compile("|".join(map(re.escape, NOISY_KEYWORDS)))
+# One compiled XPath matching every element whose id/class/role contains a noisy keyword
+_NOISY_XPATH = etree.XPath(".//*[" + " or ".join(
+    "contains(translate(concat(@id, ' ', @class, ' ', @role), "
+    f"'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{kw}')"
+    for kw in NOISY_KEYWORDS
+) + "]")
+_MULTI_NL = re.compile(r"\n{3,}")
+_MULTI_SP = re.compile(r"[ \t]{2,}")
 
 # Jinja filter
 @app.template_filter('intcomma')
@@ -36,15 +118,24 @@ def intcomma_filter(value):
         return value
 
 
-def calculate_stats(text: str, summary: str = "") -> dict:
-    original_words = len(text.split()) if text else 0
-    original_chars = len(text) if text else 0
-    original_chars_no_spaces = len(text.replace(" ", "")) if text else 0
-    summary_words = len(summary.split()) if summary else 0
-    summary_chars = len(summary) if summary else 0
+def calculate_stats(text: str, summary: str = "", summary_sentences=None) -> dict:
+    text = text or ""
+    summary = summary or ""
+    original_chars = len(text)
+    summary_chars = len(summary)
+    # str.count scans in C without building the space-free copy replace() made
+    original_chars_no_spaces = original_chars - text.count(" ")
+    # split() stays for word counts: it is a single C pass and, unlike counting
+    # spaces, handles newlines, tabs and runs of whitespace correctly
+    original_words = len(text.split())
+    if summary_sentences is not None:
+        # summary is these sentences joined by single spaces
+        summary_words = sum(len(s.split()) for s in summary_sentences)
+    else:
+        summary_words = len(summary.split())
     compression_ratio = 0.0
-    if text and summary and len(text) > 0:
-        compression_ratio = round((1 - (len(summary) / len(text))) * 100, 1)
+    if original_chars and summary_chars:
+        compression_ratio = round((1 - (summary_chars / original_chars)) * 100, 1)
     return {
         "original_words": original_words,
         "original_chars": original_chars,
@@ -55,9 +146,52 @@ def calculate_stats(text: str, summary: str = "") -> dict:
     }
 
 
+def _get_executor() -> ProcessPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                ctx = multiprocessing.get_context("forkserver")
+                ctx.set_forkserver_preload(["summarizer"])
+                _EXECUTOR = ProcessPoolExecutor(max_workers=SUMMARIZE_WORKERS, mp_context=ctx)
+    return _EXECUTOR
+
+
+def _reset_executor(broken: ProcessPoolExecutor) -> None:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is broken:
+            _EXECUTOR = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_summarizer(text: str, ratio: float):
+    # Returns (summary, summary_sentences); only decides where the work runs,
+    # the cache stays in this process either way
+    if not USE_PROCESS_POOL:
+        return summarize_text_ex(text, ratio)
+    return summarize_cached(text, ratio, _summarize_in_pool)
+
+
+def _summarize_in_pool(text: str, ratio: float) -> tuple:
+    executor = _get_executor()
+    try:
+        future = executor.submit(summarize_sentences, text, ratio)
+        return future.result(timeout=SUMMARIZE_TIMEOUT)
+    except BrokenProcessPool:
+        logger.exception("Summarizer pool broke; rebuilding it")
+        _reset_executor(executor)
+        raise
+    except FutureTimeoutError:
+        if not future.cancel():
+            logger.warning("Summarization exceeded %ss and is still occupying a pool worker", SUMMARIZE_TIMEOUT)
+        raise
+
+
 # ---------------------
 # URL helpers & extract
 # ---------------------
+@lru_cache(maxsize=1024)
 def _is_valid_url(candidate: str):
     if not candidate:
         return None
@@ -73,11 +207,147 @@ def _is_valid_url(candidate: str):
     return candidate
 
 
-def _extract_with_readability(html: str) -> str:
+def _extract_with_readability(html) -> str:
     doc = Document(html)
     summary_html = doc.summary()
     soup = BeautifulSoup(summary_html, "html.parser")
-    return soup.get_text(separator="\n\n", strip=True)
+    try:
+        return soup.get_text(separator="\n\n", strip=True)
+    finally:
+        soup.decompose()
+
+
+def _clean_whitespace(text: str) -> str:
+    return _MULTI_NL.sub("\n\n", _MULTI_SP.sub(" ", text)).strip()
+
+
+def _joined_text(el, separator: str) -> str:
+    # Equivalent of BeautifulSoup's get_text(separator, strip=True)
+    return separator.join(t.strip() for t in el.itertext() if t.strip())
+
+
+def _parse_stripped(raw: bytes, encoding: Optional[str] = None):
+    # Parse with lxml and drop non-content tags and noisy containers without
+    # walking the tree from Python
+    try:
+        tree = lhtml.fromstring(raw, parser=lhtml.HTMLParser(encoding=encoding))
+    except LookupError:
+        # charset unknown to libxml2: let it sniff <meta charset> instead
+        return _parse_stripped(raw) if encoding else None
+    except (etree.ParserError, ValueError):
+        return None
+    etree.strip_elements(tree, etree.Comment, *REMOVED_TAGS, with_tail=False)
+    for el in _NOISY_XPATH(tree):
+        # never drop the whole page because of a body class like "has-navbar"
+        if el.getparent() is not None and el.tag != "body":
+            el.drop_tree()
+    return tree
+
+
+def _is_noisy_element(el) -> bool:
+    if el.tag in REMOVED_TAGS:
+        return True
+    # The root and <body> are never dropped, matching _parse_stripped (whose
+    # XPath skips the root), so e.g. <html class="has-navbar-fixed-top"> is fine
+    if el.tag in ("html", "body"):
+        return False
+    attrs = f"{el.get('id') or ''} {el.get('class') or ''} {el.get('role') or ''}"
+    return _NOISY_RE.search(attrs.lower()) is not None
+
+
+def _release(el) -> None:
+    # Free a processed element and everything before it in the same parent
+    el.clear(keep_tail=True)
+    parent = el.getparent()
+    if parent is not None:
+        while el.getprevious() is not None:
+            del parent[0]
+
+
+def _stream_paragraphs(raw: bytes, encoding: Optional[str] = None):
+    # Collect the first top-level <article> text and all clean <p> texts from
+    # iterparse end events. Each paragraph is freed as soon as it has been
+    # read, so peak memory stays near one element instead of the whole tree,
+    # and parsing stops once MAX_TEXT_LENGTH worth of text has been found.
+    article_text = ""
+    paragraphs = []
+    total = 0
+    last_parent = None
+    last_state = (False, False)
+    try:
+        context = etree.iterparse(io.BytesIO(raw), events=("end",), tag=("p", "article"), encoding=encoding,
+                                  html=True, remove_comments=True, huge_tree=False)
+        for _, el in context:
+            parent = el.getparent()
+            if parent is not last_parent:
+                # (noisy, inside_article) for the ancestor chain, reused by siblings
+                noisy = in_article = False
+                anc = parent
+                while anc is not None:
+                    if anc.tag == "article":
+                        in_article = True
+                    if _is_noisy_element(anc):
+                        noisy = True
+                        break
+                    anc = anc.getparent()
+                last_parent, last_state = parent, (noisy, in_article)
+            noisy, in_article = last_state
+            if noisy or _is_noisy_element(el):
+                # noise inside an <article> is stripped when the article ends
+                if not in_article:
+                    _release(el)
+                continue
+
+            if el.tag == "article":
+                if not in_article:
+                    etree.strip_elements(el, *REMOVED_TAGS, with_tail=False)
+                    for noise in _NOISY_XPATH(el):
+                        noise.clear(keep_tail=True)
+                    article_text = _joined_text(el, "\n\n")
+                    if article_text:
+                        break
+            else:
+                etree.strip_elements(el, *REMOVED_TAGS, with_tail=False)
+                p_text = _joined_text(el, " ")
+                if len(p_text) >= 40:
+                    paragraphs.append(p_text)
+                    total += len(p_text)
+                    if total > MAX_TEXT_LENGTH:
+                        break
+            # paragraphs inside an <article> stay until the article itself ends
+            if not in_article:
+                _release(el)
+    except LookupError:
+        # charset unknown to libxml2: let it sniff <meta charset> instead
+        if encoding:
+            return _stream_paragraphs(raw)
+    except etree.LxmlError as e:
+        logger.info("Streaming HTML parse stopped early: %s", e)
+    return article_text, paragraphs
+
+
+def _largest_text_block(raw: bytes, encoding: Optional[str] = None) -> str:
+    tree = _parse_stripped(raw, encoding)
+    if tree is None:
+        return ""
+    # Single pass keeping only the longest container; its text is built once at the end
+    best_len = 200
+    best_el = None
+    for el in tree.iter("div", "section", "main"):
+        t_len = sum(len(t.strip()) for t in el.itertext())
+        if t_len > best_len:
+            best_len, best_el = t_len, el
+    return _joined_text(best_el, "\n\n") if best_el is not None else ""
+
+
+def _extract_generic(raw: bytes, encoding: Optional[str] = None) -> str:
+    # Prefer <article>, then paragraphs, then the largest text block
+    article_text, paragraphs = _stream_paragraphs(raw, encoding)
+    if article_text:
+        return article_text
+    if paragraphs:
+        return "\n\n".join(paragraphs)
+    return _largest_text_block(raw, encoding)
 
 
 def _extract_wikipedia(soup: BeautifulSoup) -> str:
@@ -105,124 +375,149 @@ def _extract_wikipedia(soup: BeautifulSoup) -> str:
     return "\n\n".join(paragraphs).strip()
 
 
+def _url_cache_get(url: str):
+    with _URL_CACHE_LOCK:
+        entry = _URL_CACHE.get(url)
+        if entry is not None:
+            _URL_CACHE.move_to_end(url)
+        return entry
+
+
+def _url_cache_put(url: str, entry: Tuple[Optional[str], Optional[str], str]) -> None:
+    with _URL_CACHE_LOCK:
+        _URL_CACHE[url] = entry
+        _URL_CACHE.move_to_end(url)
+        while len(_URL_CACHE) > URL_CACHE_MAX:
+            _URL_CACHE.popitem(last=False)
+
+
+def _url_cache_evict(url: str) -> None:
+    with _URL_CACHE_LOCK:
+        _URL_CACHE.pop(url, None)
+
+
 def extract_readable_text(url: str, timeout: int = 12) -> str:
     normalized = _is_valid_url(url)
     if not normalized:
         raise ValueError("Invalid URL. Please include a valid http(s) URL.")
 
-    headers = {
-        "User-Agent": "Summarix/1.0 (+https://example.com/) Python requests",
-        "Accept": "text/html,application/xhtml+xml"
-    }
-
+    # Revalidate a previous extraction instead of refetching the whole page
+    cached = _url_cache_get(normalized)
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    # Stream so headers can be checked before any of the body is downloaded
     try:
-        resp = requests.get(normalized, headers=headers, timeout=timeout, allow_redirects=True)
+        with SESSION.get(normalized, headers=headers, timeout=timeout, allow_redirects=True, stream=True) as resp:
+            if resp.status_code == 304 and cached:
+                logger.info("Page not modified, reusing cached extraction for %s", normalized)
+                return cached[2]
+
+            if resp.status_code != 200:
+                raise ValueError(f"Failed to fetch page: HTTP {resp.status_code}")
+
+            # The page changed: drop the old entry unless this response replaces it,
+            # so stale validators aren't sent again
+            if cached:
+                _url_cache_evict(normalized)
+            raw = _read_html_body(resp)
     except requests.RequestException as e:
         logger.warning("Network error fetching URL %s: %s", url, e)
         raise ValueError(f"Network error while fetching the URL: {e}")
 
-    if resp.status_code != 200:
-        raise ValueError(f"Failed to fetch page: HTTP {resp.status_code}")
+    text = _extract_from_response(resp, raw, normalized)
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        _url_cache_put(normalized, (etag, last_modified, text))
+    return text
+
+
+def _read_html_body(resp: requests.Response) -> bytes:
+    content_type = (resp.headers.get("Content-Type") or "").lower()
+    # Reject obvious binaries (PDF, video, images) before reading the body
+    if content_type and not ("html" in content_type or "xml" in content_type or content_type.startswith("text/")):
+        raise ValueError("URL did not return HTML content.")
 
+    too_large = f"Page is too large to summarize (max {MAX_FETCH_BYTES // 1_000_000} MB)."
+    try:
+        declared = int(resp.headers.get("Content-Length") or 0)
+    except ValueError:
+        declared = 0
+    if declared > MAX_FETCH_BYTES:
+        raise ValueError(too_large)
+
+    chunks = []
+    size = 0
+    for chunk in resp.iter_content(chunk_size=65536):
+        size += len(chunk)
+        if size > MAX_FETCH_BYTES:
+            raise ValueError(too_large)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _declared_encoding(resp: requests.Response) -> Optional[str]:
+    # Only trust an explicit charset; requests otherwise assumes ISO-8859-1 for
+    # text/* and the parsers do better sniffing <meta charset> themselves.
+    # The IANA name is passed through as-is: libxml2/iconv know "EUC-JP",
+    # not Python's "euc_jp"
+    if "charset=" not in (resp.headers.get("Content-Type") or "").lower():
+        return None
+    return resp.encoding or None
+
+
+def _readability_input(raw: bytes, encoding: Optional[str]):
+    # readability only sniffs <meta>; without it, it runs chardet over the whole
+    # page. A header-declared charset lets us decode once ourselves instead
+    if encoding:
+        try:
+            return raw.decode(encoding, errors="replace")
+        except LookupError:
+            pass
+    return raw
+
+
+def _extract_from_response(resp: requests.Response, raw: bytes, normalized: str) -> str:
+    # Work on the raw bytes throughout; the parsers decode them once themselves
     content_type = (resp.headers.get("Content-Type") or "")
-    body = resp.text or ""
-    if "html" not in content_type.lower() and "<html" not in body.lower():
+    if "html" not in content_type.lower() and b"<html" not in raw[:4096].lower():
         raise ValueError("URL did not return HTML content.")
+    encoding = _declared_encoding(resp)
 
     # Try readability first (if available)
     if HAS_READABILITY:
         try:
-            text = _extract_with_readability(resp.text)
+            text = _extract_with_readability(_readability_input(raw, encoding))
             if text and len(text) >= MIN_TEXT_LENGTH:
                 logger.info("Used readability-lxml extraction (len=%d)", len(text))
-                return re.sub(r'\n{3,}', '\n\n', re.sub(r'[ \t]{2,}', ' ', text)).strip()
+                return _clean_whitespace(text)
         except Exception as e:
             logger.info("Readability extraction failed: %s", e)
 
-    soup = BeautifulSoup(resp.content, "html.parser")
-
     # Domain-specific extraction for Wikipedia (reliably structured)
     parsed = urlparse(normalized)
     domain = parsed.netloc.lower()
     if "wikipedia.org" in domain:
-        text = _extract_wikipedia(soup)
+        soup = BeautifulSoup(raw, "lxml", parse_only=WIKI_STRAINER, from_encoding=encoding)
+        try:
+            text = _extract_wikipedia(soup)
+        finally:
+            # break the tree's parent/sibling links now instead of leaving it to the GC
+            soup.decompose()
         if text and len(text) >= MIN_TEXT_LENGTH:
             logger.info("Used Wikipedia-specific extraction (len=%d)", len(text))
-            return re.sub(r'\n{3,}', '\n\n', re.sub(r'[ \t]{2,}', ' ', text)).strip()
+            return _clean_whitespace(text)
         # else continue to heuristics
 
     # Generic heuristics
-    # Remove non-content tags
-    for tag_name in ("script", "style", "noscript", "iframe", "svg", "picture", "figure", "button", "input", "form"):
-        for t in soup.find_all(tag_name):
-            t.decompose()
-
-    for tag in soup.find_all(["nav", "header", "footer", "aside"]):
-        tag.decompose()
-
-    noisy_keywords = [
-        "nav", "menu", "header", "footer", "sidebar", "advert", "ads",
-        "cookie", "modal", "popup", "subscribe", "promo", "related", "breadcrumb", "share",
-        "comment", "comments", "footer", "toolbar", "breadcrumb", "infobox"
-    ]
-
-    for elem in list(soup.find_all(True, attrs={"role": True})):
-        role = (elem.get("role") or "").lower()
-        if any(k in role for k in noisy_keywords):
-            elem.decompose()
-
-    for attr in ("id", "class"):
-        for kw in noisy_keywords:
-            selector = f'[{attr}*="{kw}"]'
-            try:
-                for tag in soup.select(selector):
-                    tag.decompose()
-            except Exception:
-                continue
-
-    # Prefer <article>
-    article_tag = soup.find("article")
-    if article_tag:
-        text = article_tag.get_text(separator="\n\n", strip=True)
-    else:
-        paragraphs = []
-        for p in soup.find_all("p"):
-            p_text = p.get_text(separator=" ", strip=True)
-            if not p_text:
-                continue
-            if len(p_text) < 40:
-                continue
-            parent = p.parent
-            skip = False
-            while parent and getattr(parent, "name", None) != "[document]":
-                pid = (parent.get("id") or "").lower()
-                pcls = " ".join(parent.get("class") or []).lower()
-                if any(k in pid for k in noisy_keywords) or any(k in pcls for k in noisy_keywords):
-                    skip = True
-                    break
-                parent = parent.parent
-            if skip:
-                continue
-            paragraphs.append(p_text)
-        if paragraphs:
-            text = "\n\n".join(paragraphs)
-        else:
-            candidates = []
-            for tag in soup.find_all(True):
-                try:
-                    t = tag.get_text(separator=" ", strip=True)
-                except Exception:
-                    continue
-                if len(t) > 200:
-                    candidates.append((len(t), t))
-            if candidates:
-                candidates.sort(reverse=True)
-                text = candidates[0][1]
-            else:
-                text = ""
-
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r"[ \t]{2,}", " ", text).strip()
+    text = _extract_generic(raw, encoding)
+    text = _clean_whitespace(text)
 
     if not text or len(text) < MIN_TEXT_LENGTH:
         logger.info("Extracted text length: %d", len(text) if text else 0)
@@ -269,11 +564,8 @@ def index():
                     error_message = f"Extracted content too long (max {MAX_TEXT_LENGTH:,} chars)."
                 else:
                     original_text = extracted
-                    try:
-                        summary = summarize_text(original_text, ratio=ratio)
-                    except TypeError:
-                        summary = summarize_text(original_text)
-                    stats = calculate_stats(original_text, summary)
+                    summary, summary_sentences = _run_summarizer(original_text, ratio)
+                    stats = calculate_stats(original_text, summary, summary_sentences)
             except ValueError as ve:
                 error_message = str(ve)
             except Exception as e:
@@ -288,11 +580,8 @@ def index():
             else:
                 original_text = text_input
                 try:
-                    try:
-                        summary = summarize_text(original_text, ratio=ratio)
-                    except TypeError:
-                        summary = summarize_text(original_text)
-                    stats = calculate_stats(original_text, summary)
+                    summary, summary_sentences = _run_summarizer(original_text, ratio)
+                    stats = calculate_stats(original_text, summary, summary_sentences)
                 except Exception:
                     logger.exception("Summarization error")
                     error_message = "Error generating summary."
@@ -327,11 +616,8 @@ def api_summarize():
             ratio = max(0.1, min(0.9, ratio))
         except Exception:
             ratio = 0.3
-        try:
-            summary = summarize_text(text, ratio=ratio)
-        except TypeError:
-            summary = summarize_text(text)
-        stats = calculate_stats(text, summary)
+        summary, summary_sentences = _run_summarizer(text, ratio)
+        stats = calculate_stats(text, summary, summary_sentences)
         return jsonify({"summary": summary, "stats": stats})
     except Exception:
         logger.exception("API summarize error")
@@ -370,4 +656,4 @@ def internal_error(error):
 
 if __name__ == "__main__":
     logger.info("Starting Summarix on http://0.0.0.0:5001")
-    app.run(debug=True, host="0.0.0.0", port=5001)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=5001)
\ No newline at end of file
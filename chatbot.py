@@ -1,64 +1,107 @@
+import hashlib
 import re
-from collections import defaultdict
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from functools import lru_cache
 
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
+from _nltk_setup import get_sent_tokenizer, get_stopwords
 
-# Ensure NLTK resources
-_resources = [("tokenizers/punkt", "punkt"), ("corpora/stopwords", "stopwords")]
-for path, name in _resources:
-    try:
-        nltk.data.find(path)
-    except LookupError:
-        nltk.download(name, quiet=True)
+STOP_WORDS = get_stopwords()
+
+_SENT_TOK = get_sent_tokenizer()
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_KEYWORD_RE = re.compile(r"[a-z0-9]{3,}")  # keyword candidates: alphanumeric runs of 3+ chars
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def _sent_tokenize(text: str):
+    return _SENT_TOK.tokenize(text)
+
+
+def _word_tokenize_lower(text: str):
+    return _WORD_RE.findall(text.lower())
+
+
+def _keyword_counter(text: str) -> Counter:
+    return Counter(w for w in _KEYWORD_RE.findall(text.lower()) if w not in STOP_WORDS)
+
+
+# Recent answers keyed by (summary digest, question)
+CHAT_CACHE_MAX = 512
+_CHAT_CACHE = OrderedDict()
+_CHAT_CACHE_LOCK = threading.Lock()
+
+# An intent matches when all words of one of its patterns occur in the question
+# (any order); earlier intents win
+INTENT_PATTERNS = {
+    "what_about": [["what", "about"], ["what", "is", "about"], ["tell", "me", "about"]],
+    "key_points": [["key", "point"], ["main", "point"], ["important", "point"], ["key", "idea"], ["what", "are", "key"]],
+    "make_shorter": [["shorter"], ["shorten"], ["condense"], ["brief"]],
+    "explain": [["explain"], ["elaborate"], ["describe"], ["clarify"]],
+    "summary_length": [["how", "long"], ["length"], ["word", "count"], ["character", "count"], ["stats"]],
+}
+
+
+def _build_intent_index(patterns):
+    # word -> ids of the rules containing it; a rule is (intent, distinct word count)
+    rules = []
+    index = defaultdict(list)
+    for intent, pats in patterns.items():
+        for pat in pats:
+            words = frozenset(pat)
+            for w in words:
+                index[w].append(len(rules))
+            rules.append((intent, len(words)))
+    return rules, dict(index)
+
+
+_INTENT_RULES, _INTENT_INDEX = _build_intent_index(INTENT_PATTERNS)
 
-STOP_WORDS = set(stopwords.words("english"))
+
+@lru_cache(maxsize=64)
+def _index_summary(summary: str):
+    # Sentences, per-sentence word sets and keyword counts of a summary,
+    # computed once and shared by every intent (and later turns)
+    sents = tuple(_sent_tokenize(summary))
+    token_sets = tuple(frozenset(_word_tokenize_lower(s)) for s in sents)
+    return sents, token_sets, _keyword_counter(summary)
 
 
 def normalize_text(text: str) -> str:
     text = text.lower().strip()
-    text = re.sub(r"[^\w\s]", "", text)
+    text = _PUNCT_RE.sub("", text)
     return text
 
 
-def extract_keywords(text: str, top_n: int = 5):
-    words = word_tokenize(text.lower())
-    freq = defaultdict(int)
-    for w in words:
-        if w.isalnum() and w not in STOP_WORDS and len(w) > 2:
-            freq[w] += 1
-    items = sorted(freq.items(), key=lambda x: x[1], reverse=True)
-    return [w for w, _ in items[:top_n]]
+def extract_keywords_from_counter(counter: Counter, top_n: int = 5):
+    return [w for w, _ in counter.most_common(top_n)]
 
 
-def detect_intent(question: str):
-    q = normalize_text(question)
-    tokens = q.split()
-    patterns = {
-        "what_about": [["what", "about"], ["what", "is", "about"], ["tell", "me", "about"]],
-        "key_points": [["key", "point"], ["main", "point"], ["important", "point"], ["key", "idea"], ["what", "are", "key"]],
-        "make_shorter": [["shorter"], ["shorten"], ["condense"], ["brief"]],
-        "explain": [["explain"], ["elaborate"], ["describe"], ["clarify"]],
-        "summary_length": [["how", "long"], ["length"], ["word", "count"], ["character", "count"], ["stats"]],
-    }
-    for intent, pats in patterns.items():
-        for pat in pats:
-            if all(p in tokens for p in pat):
-                return intent
-    return "general"
+# Public API kept for callers outside the chat flow, which itself goes through
+# _index_summary + extract_keywords_from_counter
+def extract_keywords(text: str, top_n: int = 5):
+    return extract_keywords_from_counter(_keyword_counter(text), top_n)
 
 
-def get_key_points(summary: str, max_points: int = 5):
-    sents = sent_tokenize(summary)
+def detect_intent(question: str):
+    tokens = set(normalize_text(question).split())
+    hits = [0] * len(_INTENT_RULES)
+    best = None
+    for t in tokens:
+        for rule_id in _INTENT_INDEX.get(t, ()):
+            hits[rule_id] += 1
+            if hits[rule_id] == _INTENT_RULES[rule_id][1] and (best is None or rule_id < best):
+                best = rule_id
+    return _INTENT_RULES[best][0] if best is not None else "general"
+
+
+def get_key_points(sents, token_sets, keywords, max_points: int = 5):
     if not sents:
         return []
-    keywords = extract_keywords(summary, top_n=10)
+    keywords = frozenset(keywords)
     scored = []
-    for s in sents:
-        ls = s.lower()
-        score = sum(1 for k in keywords if k in ls)
-        scored.append((s.strip(), score))
+    for s, tokens in zip(sents, token_sets):
+        scored.append((s.strip(), len(keywords & tokens)))
     scored.sort(key=lambda x: x[1], reverse=True)
     key_points = [s for s, sc in scored[:max_points] if sc > 0]
     if not key_points:
@@ -72,69 +115,90 @@ def make_shorter(summary: str, ratio: float = 0.5):
         new = summarize_text(summary, ratio=ratio)
         return new or summary
     except Exception:
-        sents = sent_tokenize(summary)
+        sents = _sent_tokenize(summary)
         n = max(1, int(len(sents) * ratio))
         return " ".join(sents[:n])
 
 
-def explain_summary(summary: str) -> str:
-    sents = sent_tokenize(summary)
+def explain_summary(summary: str, sents, keywords) -> str:
     word_count = len(summary.split())
     char_count = len(summary)
-    keywords = extract_keywords(summary, top_n=5)
     explanation = f"This summary contains {len(sents)} sentence(s), approximately {word_count} words ({char_count} characters). "
     if keywords:
         explanation += "Key topics: " + ", ".join(keywords) + "."
     return explanation
 
 
-def get_summary_stats(summary: str) -> str:
+def get_summary_stats(summary: str, sentence_count: int) -> str:
     word_count = len(summary.split())
     char_count = len(summary)
     char_count_no_spaces = len(summary.replace(" ", ""))
-    sentence_count = len(sent_tokenize(summary))
     paragraph_count = len([p for p in summary.split("\n\n") if p.strip()])
     s = f"📊 Summary Statistics:\n\n• Words: {word_count:,}\n• Characters: {char_count:,}\n• Characters (no spaces): {char_count_no_spaces:,}\n• Sentences: {sentence_count}\n• Paragraphs: {paragraph_count}"
     return s
 
 
+def _chat_cache_get(key):
+    with _CHAT_CACHE_LOCK:
+        answer = _CHAT_CACHE.get(key)
+        if answer is not None:
+            _CHAT_CACHE.move_to_end(key)
+        return answer
+
+
+def _chat_cache_put(key, answer: str) -> None:
+    with _CHAT_CACHE_LOCK:
+        _CHAT_CACHE[key] = answer
+        _CHAT_CACHE.move_to_end(key)
+        while len(_CHAT_CACHE) > CHAT_CACHE_MAX:
+            _CHAT_CACHE.popitem(last=False)
+
+
+def _answer(question: str, summary: str) -> str:
+    intent = detect_intent(question)
+    sents, token_sets, keyword_freq = _index_summary(summary)
+    if intent == "what_about":
+        keywords = extract_keywords_from_counter(keyword_freq, top_n=5)
+        first = sents[0] if sents else summary[:200]
+        return f"This summary is about: {', '.join(keywords)}. For example: {first}"
+    elif intent == "key_points":
+        keywords = extract_keywords_from_counter(keyword_freq, top_n=10)
+        points = get_key_points(sents, token_sets, keywords, max_points=5)
+        if not points:
+            return "I couldn't extract clear key points."
+        out = "🔑 Key Points:\n"
+        for i, p in enumerate(points, 1):
+            out += f"{i}. {p}\n"
+        return out.strip()
+    elif intent == "make_shorter":
+        short = make_shorter(summary, ratio=0.5)
+        return f"📝 Shorter version:\n\n{short}"
+    elif intent == "explain":
+        keywords = extract_keywords_from_counter(keyword_freq, top_n=5)
+        return f"💡 Explanation:\n\n{explain_summary(summary, sents, keywords)}"
+    elif intent == "summary_length":
+        return get_summary_stats(summary, len(sents))
+    else:
+        qset = frozenset(w for w in _word_tokenize_lower(question) if w not in STOP_WORDS)
+        relevant = [s for s, tokens in zip(sents, token_sets) if qset & tokens]
+        if relevant:
+            return "Based on your question, here are relevant sentences:\n\n" + " ".join(relevant[:3])
+        else:
+            return "I didn't find a direct answer in the summary. Try: 'What is this about?', 'Give key points', 'Make it shorter', or 'How long is this summary?'"
+
+
 def chat_with_summary(question: str, summary: str) -> str:
     if not summary or not summary.strip():
         return "I don't have a summary to discuss yet. Please generate a summary first!"
     if not question or not question.strip():
         return "Please ask a question about the summary!"
-    intent = detect_intent(question)
+    key = (hashlib.blake2b(summary.encode("utf-8"), digest_size=16).digest(), question.strip())
+    answer = _chat_cache_get(key)
+    if answer is not None:
+        return answer
     try:
-        if intent == "what_about":
-            keywords = extract_keywords(summary, top_n=5)
-            first = sent_tokenize(summary)[0] if sent_tokenize(summary) else summary[:200]
-            return f"This summary is about: {', '.join(keywords)}. For example: {first}"
-        elif intent == "key_points":
-            points = get_key_points(summary, max_points=5)
-            if not points:
-                return "I couldn't extract clear key points."
-            out = "🔑 Key Points:\n"
-            for i, p in enumerate(points, 1):
-                out += f"{i}. {p}\n"
-            return out.strip()
-        elif intent == "make_shorter":
-            short = make_shorter(summary, ratio=0.5)
-            return f"📝 Shorter version:\n\n{short}"
-        elif intent == "explain":
-            return f"💡 Explanation:\n\n{explain_summary(summary)}"
-        elif intent == "summary_length":
-            return get_summary_stats(summary)
-        else:
-            qwords = [w for w in word_tokenize(question.lower()) if w.isalnum() and w not in STOP_WORDS]
-            sents = sent_tokenize(summary)
-            relevant = []
-            for s in sents:
-                ls = s.lower()
-                if any(q in ls for q in qwords):
-                    relevant.append(s)
-            if relevant:
-                return "Based on your question, here are relevant sentences:\n\n" + " ".join(relevant[:3])
-            else:
-                return "I didn't find a direct answer in the summary. Try: 'What is this about?', 'Give key points', 'Make it shorter', or 'How long is this summary?'"
+        answer = _answer(question, summary)
     except Exception:
-        return "I encountered an error processing your question. Please try rephrasing it."
\ No newline at end of file
+        return "I encountered an error processing your question. Please try rephrasing it."
+    _chat_cache_put(key, answer)
+    return answer
@@ -0,0 +1,20 @@
+# Production server config: gunicorn -c gunicorn.conf.py app:app
+import os
+
+bind = os.environ.get("SUMMARIX_BIND", "0.0.0.0:5001")
+
+# Threaded workers handle the network-bound URL fetches; CPU-bound
+# summarization is handed off to app.py's process pool
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("SUMMARIX_THREADS", 8))
+
+# Turn on app.py's summarizer process pool, sized so all workers' pools
+# together match the core count
+os.environ.setdefault("SUMMARIX_PROCESS_POOL", "1")
+os.environ.setdefault("SUMMARIX_SUMMARIZE_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+timeout = 60
+
+# Import the app (NLTK data, stopwords, Punkt model) once in the
+# master so workers inherit it through fork instead of loading it per worker
+preload_app = True
@@ -1,60 +1,133 @@
+import hashlib
 import re
-from collections import defaultdict
+import threading
+from collections import OrderedDict
 
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
 
-# Ensure NLTK resources
-_resources = [("tokenizers/punkt", "punkt"), ("corpora/stopwords", "stopwords")]
-for path, name in _resources:
-    try:
-        nltk.data.find(path)
-    except LookupError:
-        nltk.download(name, quiet=True)
+from _nltk_setup import get_sent_tokenizer, get_stopwords
+
+# Optional numba JIT for the scoring kernel
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except Exception:
+    HAS_NUMBA = False
+
+STOP_WORDS = get_stopwords()
+_STOP_LIST = sorted(STOP_WORDS)
+_TOKEN_PATTERN = r"(?u)\b\w+\b"
+_TOKEN_RE = re.compile(_TOKEN_PATTERN)
+
+_SENT_TOK = get_sent_tokenizer()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Recent (summary, sentences) results keyed by (text digest, ratio)
+SUMMARY_CACHE_MAX = 256
+_SUM_CACHE = OrderedDict()
+_SUM_CACHE_LOCK = threading.Lock()
 
-STOP_WORDS = set(stopwords.words("english"))
+
+def _sent_tokenize(text: str):
+    return _SENT_TOK.tokenize(text)
 
 
 def _clean_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _summary_key(text: str, ratio: float):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), round(float(ratio), 2)
+
+
+def get_cached_summary(text: str, ratio: float = 0.3):
+    key = _summary_key(text, ratio)
+    with _SUM_CACHE_LOCK:
+        result = _SUM_CACHE.get(key)
+        if result is not None:
+            _SUM_CACHE.move_to_end(key)
+        return result
+
+
+def cache_summary(text: str, ratio: float, result) -> None:
+    key = _summary_key(text, ratio)
+    with _SUM_CACHE_LOCK:
+        _SUM_CACHE[key] = result
+        _SUM_CACHE.move_to_end(key)
+        while len(_SUM_CACHE) > SUMMARY_CACHE_MAX:
+            _SUM_CACHE.popitem(last=False)
+
+
+if HAS_NUMBA:
+    # Compiled eagerly from an explicit signature (CountVectorizer's CSR dtypes),
+    # so nothing runs at import: no threading layer is started in a gunicorn
+    # master that later forks. Serial on purpose: rows number in the hundreds.
+    @njit("float64[:](int32[:], int32[:], int64[:], float64[:], int64[:])", cache=True)
+    def _score_sentences(indptr, indices, data, freq, lengths):
+        # Walks the CSR count matrix once per row; lengths are full token
+        # counts, stopwords included, since the matrix only holds content words
+        n = len(indptr) - 1
+        out = np.empty(n, np.float64)
+        for i in range(n):
+            s = 0.0
+            for j in range(indptr[i], indptr[i + 1]):
+                s += data[j] * freq[indices[j]]
+            out[i] = s / lengths[i] if lengths[i] else 0.0
+        return out
 
 
 def summarize_text(text: str, ratio: float = 0.3) -> str:
+    return summarize_text_ex(text, ratio)[0]
+
+
+def summarize_text_ex(text: str, ratio: float = 0.3):
+    # Like summarize_text, but returns (summary, selected sentences) so callers
+    # can reuse the sentence split
+    return summarize_cached(text, ratio)
+
+
+def summarize_cached(text: str, ratio: float = 0.3, producer=None):
+    # Wraps a sentence producer (summarize_sentences by default) with the
+    # summary cache; app.py passes one that runs it in a process pool
     if not text or not text.strip():
-        return ""
+        return "", ()
+    result = get_cached_summary(text, ratio)
+    if result is None:
+        sentences = (producer or summarize_sentences)(text, ratio)
+        result = (" ".join(sentences), sentences)
+        cache_summary(text, ratio, result)
+    return result
+
+
+def summarize_sentences(text: str, ratio: float = 0.3) -> tuple:
+    # Selected sentences, uncached and lock-free (safe to run in a worker process)
     ratio = max(0.1, min(0.9, float(ratio)))
     text = _clean_text(text)
-    sentences = sent_tokenize(text)
+    sentences = _sent_tokenize(text)
     if len(sentences) <= 1:
-        return text
-    words = word_tokenize(text.lower())
-    freq = defaultdict(int)
-    for w in words:
-        if w.isalnum() and w not in STOP_WORDS:
-            freq[w] += 1
-    if not freq:
-        n = max(1, int(len(sentences) * ratio))
-        return " ".join(sentences[:n])
-    maxf = max(freq.values())
-    for w in list(freq.keys()):
-        freq[w] = freq[w] / maxf
-    sent_scores = {}
-    for s in sentences:
-        s_words = word_tokenize(s.lower())
-        score = 0.0
-        count = 0
-        for w in s_words:
-            if w.isalnum():
-                count += 1
-                if w in freq:
-                    score += freq[w]
-        if count > 0:
-            sent_scores[s] = score / count
+        return (text,)
     select_n = max(1, int(len(sentences) * ratio))
-    ranked = sorted(sent_scores.items(), key=lambda x: x[1], reverse=True)
-    top_sentences = set([s for s, _ in ranked[:select_n]])
-    summary_sentences = [s for s in sentences if s in top_sentences]
-    if not summary_sentences:
-        summary_sentences = sentences[:select_n]
-    return " ".join(summary_sentences)
\ No newline at end of file
+    # sentences x vocab count matrix (sparse); replaces per-sentence re-tokenization
+    vectorizer = CountVectorizer(stop_words=_STOP_LIST, token_pattern=_TOKEN_PATTERN, lowercase=True)
+    try:
+        counts = vectorizer.fit_transform(sentences)
+    except ValueError:
+        # empty vocabulary: nothing but stopwords/punctuation
+        return tuple(sentences[:select_n])
+    word_freq = np.asarray(counts.sum(axis=0)).ravel().astype(np.float64)
+    word_freq /= word_freq.max()
+    # Normalize by every word in the sentence, stopwords included
+    lengths = np.array([len(_TOKEN_RE.findall(s)) for s in sentences], dtype=np.int64)
+    if HAS_NUMBA and counts.indptr.dtype == np.int32 and counts.data.dtype == np.int64:
+        scores = _score_sentences(counts.indptr, counts.indices, counts.data, word_freq, lengths)
+    else:
+        scores = (counts @ word_freq) / np.maximum(lengths, 1)
+    # Stable sort so ties at the cutoff go to the earliest sentence; sentences
+    # without any word tokens are never picked
+    order = np.argsort(-scores, kind="stable")
+    top_idx = order[lengths[order] > 0][:select_n]
+    keep = np.zeros(len(sentences), dtype=bool)
+    keep[top_idx] = True
+    return tuple(s for s, kept in zip(sentences, keep) if kept)